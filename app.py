@@ -1,11 +1,35 @@
 from flask import Flask, render_template, request, jsonify
-from engine.data import get_stock_data
+from engine.data import get_stock_data, get_stock_data_batch, cache_ttl
 from engine.indicators import calculate_indicators
 from engine.predictors import predict_price
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import numpy as np
+import orjson
+import struct
+import threading
+import time
 import traceback
 
 app = Flask(__name__)
 
+# Full /api/analyze responses keyed by (ticker, interval) -> (expiry, response), LRU-evicted
+RESPONSE_CACHE_SIZE = 256
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Series sent by /api/chart, in body order
+CHART_FIELDS = ('open', 'high', 'low', 'close')
+
+# Upper bound on tickers analyzed concurrently by one batch request
+BATCH_WORKERS = 8
+
+# (indicators, predictions) keyed by a content hash of the price arrays, LRU-evicted
+ANALYSIS_CACHE_SIZE = 256
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
 @app.route('/')
 def index():
     """Render main dashboard"""
@@ -20,15 +44,32 @@ def analyze():
         "ticker": "AAPL",
         "interval": "1d"
     }
+    or, to analyze several symbols with a single download:
+    {
+        "tickers": ["AAPL", "MSFT"],
+        "interval": "1d"
+    }
     """
     try:
         data = request.get_json()
-        ticker = data.get('ticker', '').upper()
         interval = data.get('interval', '1d')
         
+        tickers = data.get('tickers')
+        if tickers:
+            if not isinstance(tickers, list) or not all(isinstance(t, str) for t in tickers):
+                return jsonify({'error': 'Tickers must be a list of ticker symbols'}), 400
+            return analyze_batch([t.upper() for t in tickers if t], interval)
+        
+        ticker = data.get('ticker', '').upper()
+        
         if not ticker:
             return jsonify({'error': 'Ticker symbol is required'}), 400
         
+        key = (ticker, interval)
+        entry = cached_response(key)
+        if entry:
+            return cached_json(entry[1], entry[0] - time.monotonic())
+        
         # Get stock data using your existing engine modules
         stock_data = get_stock_data(ticker, interval)
         
@@ -37,61 +78,10 @@ def analyze():
                 'error': f'Failed to fetch data for {ticker}'
             }), 404
         
-        # Calculate technical indicators
-        indicators = calculate_indicators(stock_data)
-        
-        # Get predictions
-        predictions = predict_price(stock_data, indicators)
-        
-        # Prepare response
-        current_price = float(stock_data['close'][-1])
-        previous_price = float(stock_data['close'][-2]) if len(stock_data['close']) > 1 else current_price
-        price_change = current_price - previous_price
-        price_change_percent = (price_change / previous_price * 100) if previous_price > 0 else 0
-        
-        # Determine signal based on indicators
-        signal = determine_signal(indicators)
-        
-        response = {
-            'ticker': ticker,
-            'interval': interval,
-            'current_price': current_price,
-            'price_change': price_change,
-            'price_change_percent': price_change_percent,
-            'signal': signal,
-            'rsi': indicators.get('rsi', 50),
-            'indicators': {
-                'rsi': indicators.get('rsi', 50),
-                'macd': indicators.get('macd', 0),
-                'ma20': indicators.get('ma20', current_price),
-                'ma50': indicators.get('ma50', current_price),
-            },
-            'predictions': {
-                'next_hour': predictions.get('next_hour', current_price),
-                'next_day': predictions.get('next_day', current_price),
-                'next_week': predictions.get('next_week', current_price),
-                'confidence': predictions.get('confidence', 75)
-            },
-            'trend': {
-                'short_term': determine_trend(indicators, 'short'),
-                'medium_term': determine_trend(indicators, 'medium'),
-                'long_term': determine_trend(indicators, 'long')
-            },
-            'volume': stock_data.get('volume', [0])[-1] if 'volume' in stock_data else 0,
-            'volatility': calculate_volatility(stock_data),
-            'risk_level': determine_risk_level(indicators),
-            'support': calculate_support(stock_data),
-            'resistance': calculate_resistance(stock_data),
-            'chart_data': {
-                'dates': stock_data.get('dates', []),
-                'open': stock_data.get('open', []),
-                'high': stock_data.get('high', []),
-                'low': stock_data.get('low', []),
-                'close': stock_data.get('close', [])
-            }
-        }
+        response = build_analysis(ticker, interval, stock_data)
+        store_response(key, response)
         
-        return jsonify(response)
+        return cached_json(response, cache_ttl(interval))
         
     except Exception as e:
         print(f"Error in analyze endpoint: {str(e)}")
@@ -100,6 +90,198 @@ def analyze():
             'error': f'Internal server error: {str(e)}'
         }), 500
 
+@app.route('/api/chart/<ticker>')
+def chart(ticker):
+    """
+    Binary OHLC series for the candlestick chart
+    Query string: ?interval=1d
+    Body: uint32 header length (little-endian), a JSON header
+    {"dates": [...], "fields": ["open", "high", "low", "close"], "dtype": "<f4", "length": n}
+    space-padded to a 4-byte boundary, then each field as n little-endian float32 values
+    """
+    ticker = ticker.upper()
+    interval = request.args.get('interval', '1d')
+    
+    stock_data = get_stock_data(ticker, interval)
+    
+    if not stock_data or 'error' in stock_data:
+        return jsonify({
+            'error': f'Failed to fetch data for {ticker}'
+        }), 404
+    
+    resp = app.response_class(chart_payload(stock_data), mimetype='application/octet-stream')
+    resp.headers['Cache-Control'] = f'public, max-age={cache_ttl(interval)}'
+    return resp
+
+def analyze_batch(tickers, interval):
+    """Analyze several tickers, fetching all uncached ones in one download"""
+    results = {}
+    missing = []
+    # The batch may only be reused while every entry in it is still fresh
+    max_age = cache_ttl(interval)
+    for ticker in tickers:
+        entry = cached_response((ticker, interval))
+        if entry:
+            results[ticker] = entry[1]
+            max_age = min(max_age, entry[0] - time.monotonic())
+        else:
+            missing.append(ticker)
+    
+    batch = get_stock_data_batch(missing, interval) if missing else {}
+    
+    fetched = []
+    for ticker in missing:
+        stock_data = batch.get(ticker)
+        if not stock_data or 'error' in stock_data:
+            results[ticker] = {'error': f'Failed to fetch data for {ticker}'}
+            # A failed fetch may succeed on retry, so the batch must not be reused
+            max_age = None
+        else:
+            fetched.append(ticker)
+    
+    # Tickers are independent, so analyze them side by side
+    if fetched:
+        with ThreadPoolExecutor(max_workers=min(len(fetched), BATCH_WORKERS)) as pool:
+            analyses = pool.map(lambda t: build_analysis(t, interval, batch[t]), fetched)
+            for ticker, response in zip(fetched, analyses):
+                results[ticker] = response
+                store_response((ticker, interval), response)
+    
+    return cached_json({'interval': interval, 'results': results}, max_age)
+
+def build_analysis(ticker, interval, stock_data):
+    """Run indicators and predictions on fetched data and build the response"""
+    # Convert price series once for the helpers below
+    close_arr = np.asarray(stock_data['close'], dtype=np.float64)
+    high_arr = np.asarray(stock_data.get('high', []), dtype=np.float64)
+    low_arr = np.asarray(stock_data.get('low', []), dtype=np.float64)
+    volumes = stock_data.get('volume', [])
+    volume = float(volumes[-1]) if len(volumes) > 0 else 0
+    
+    # Reuse indicators/predictions when the same prices were analyzed before
+    key = data_key(stock_data)
+    cached = cached_analysis(key)
+    if cached:
+        indicators, predictions = cached
+    else:
+        # Calculate technical indicators
+        indicators = calculate_indicators(stock_data)
+        
+        # Get predictions
+        predictions = predict_price(stock_data, indicators)
+        
+        store_analysis(key, indicators, predictions)
+    
+    # Prepare response
+    current_price = float(close_arr[-1])
+    previous_price = float(close_arr[-2]) if len(close_arr) > 1 else current_price
+    price_change = current_price - previous_price
+    price_change_percent = (price_change / previous_price * 100) if previous_price > 0 else 0
+    
+    # Determine signal based on indicators
+    signal = determine_signal(indicators)
+    
+    return {
+        'ticker': ticker,
+        'interval': interval,
+        'current_price': current_price,
+        'price_change': price_change,
+        'price_change_percent': price_change_percent,
+        'signal': signal,
+        'rsi': indicators.get('rsi', 50),
+        'indicators': {
+            'rsi': indicators.get('rsi', 50),
+            'macd': indicators.get('macd', 0),
+            'ma20': indicators.get('ma20', current_price),
+            'ma50': indicators.get('ma50', current_price),
+        },
+        'predictions': {
+            'next_hour': predictions.get('next_hour', current_price),
+            'next_day': predictions.get('next_day', current_price),
+            'next_week': predictions.get('next_week', current_price),
+            'confidence': predictions.get('confidence', 75)
+        },
+        'trend': {
+            'short_term': determine_trend(indicators, 'short'),
+            'medium_term': determine_trend(indicators, 'medium'),
+            'long_term': determine_trend(indicators, 'long')
+        },
+        'volume': volume,
+        'volatility': calculate_volatility(close_arr),
+        'risk_level': determine_risk_level(indicators),
+        'support': calculate_support(low_arr),
+        'resistance': calculate_resistance(high_arr)
+    }
+
+def cached_response(key):
+    """Return the (expiry, response) entry for key if it is still fresh, dropping it if not"""
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return entry
+
+def store_response(key, response):
+    """Cache a response for the TTL of its interval, evicting the least recently used entry"""
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic() + cache_ttl(key[1]), response)
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+def data_key(stock_data):
+    """Content hash of the price/volume arrays the indicators are computed from"""
+    digest = hashlib.blake2b(digest_size=16)
+    for field in ('close', 'high', 'low', 'volume'):
+        digest.update(np.ascontiguousarray(stock_data.get(field, []), dtype=np.float64))
+    return digest.digest()
+
+def cached_analysis(key):
+    """Return cached (indicators, predictions) for key, marking it recently used"""
+    with _analysis_cache_lock:
+        entry = _analysis_cache.get(key)
+        if entry:
+            _analysis_cache.move_to_end(key)
+        return entry
+
+def store_analysis(key, indicators, predictions):
+    """Cache (indicators, predictions), evicting the least recently used entry"""
+    with _analysis_cache_lock:
+        _analysis_cache[key] = (indicators, predictions)
+        _analysis_cache.move_to_end(key)
+        if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+def cached_json(response, max_age):
+    """JSON response that clients may reuse for max_age seconds (never, if max_age is None)"""
+    resp = app.response_class(
+        orjson.dumps(response, option=orjson.OPT_SERIALIZE_NUMPY),
+        mimetype='application/json'
+    )
+    if max_age is None:
+        resp.headers['Cache-Control'] = 'no-store'
+    else:
+        resp.headers['Cache-Control'] = f'public, max-age={max(int(max_age), 0)}'
+    return resp
+
+def chart_payload(stock_data):
+    """Pack dates and OHLC arrays into the /api/chart binary layout"""
+    values = np.stack([
+        np.asarray(stock_data[field], dtype=np.float64) for field in CHART_FIELDS
+    ]).astype('<f4')
+    header = orjson.dumps({
+        'dates': stock_data['dates'],
+        'fields': CHART_FIELDS,
+        'dtype': '<f4',
+        'length': values.shape[1]
+    })
+    header += b' ' * (-(4 + len(header)) % 4)
+    return struct.pack('<I', len(header)) + header + values.tobytes()
+
 def determine_signal(indicators):
     """Determine BUY/SELL/HOLD signal based on indicators"""
     rsi = indicators.get('rsi', 50)
@@ -139,10 +321,8 @@ def determine_trend(indicators, timeframe):
     else:
         return 'Neutral ➡️'
 
-def calculate_volatility(stock_data):
-    """Calculate volatility from stock data"""
-    import numpy as np
-    closes = [float(x) for x in stock_data.get('close', [])]
+def calculate_volatility(closes):
+    """Calculate volatility from a float64 array of closing prices"""
     if len(closes) < 2:
         return 0
     
@@ -161,21 +341,17 @@ def determine_risk_level(indicators):
     else:
         return 'Low'
 
-def calculate_support(stock_data):
-    """Calculate support level"""
-    import numpy as np
-    lows = [float(x) for x in stock_data.get('low', [])]
-    if not lows:
+def calculate_support(lows):
+    """Calculate support level from a float64 array of lows"""
+    if len(lows) == 0:
         return 0
-    return float(np.min(lows[-20:]))  # Last 20 days minimum
+    return float(lows[-20:].min())  # Last 20 days minimum
 
-def calculate_resistance(stock_data):
-    """Calculate resistance level"""
-    import numpy as np
-    highs = [float(x) for x in stock_data.get('high', [])]
-    if not highs:
+def calculate_resistance(highs):
+    """Calculate resistance level from a float64 array of highs"""
+    if len(highs) == 0:
         return 0
-    return float(np.max(highs[-20:]))  # Last 20 days maximum
+    return float(highs[-20:].max())  # Last 20 days maximum
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -2,16 +2,40 @@
 Stock Prediction Engine Package
 """
 
-from .data import get_stock_data, get_current_price, get_stock_info
-from .indicators import calculate_indicators
-from .predictors import predict_price
+import importlib
+
+# Public name -> submodule defining it; each submodule (and its numpy/pandas/
+# numba imports) is only loaded when one of its names is first accessed
+_EXPORTS = {
+    'get_stock_data': 'data',
+    'get_stock_data_batch': 'data',
+    'get_current_price': 'data',
+    'get_stock_info': 'data',
+    'calculate_indicators': 'indicators',
+    'warm_up': 'indicators',
+    'predict_price': 'predictors'
+}
 
 __all__ = [
     'get_stock_data',
+    'get_stock_data_batch',
     'get_current_price',
     'get_stock_info',
     'calculate_indicators',
     'predict_price'
 ]
 
-__version__ = '1.0.0'
\ No newline at end of file
+__version__ = '1.0.0'
+
+
+def __getattr__(name):
+    """Resolve a public name by importing its submodule (PEP 562)"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
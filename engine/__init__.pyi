@@ -0,0 +1,14 @@
+from .data import get_stock_data, get_stock_data_batch, get_current_price, get_stock_info
+from .indicators import calculate_indicators, warm_up
+from .predictors import predict_price
+
+__all__ = [
+    'get_stock_data',
+    'get_stock_data_batch',
+    'get_current_price',
+    'get_stock_info',
+    'calculate_indicators',
+    'predict_price'
+]
+
+__version__: str
@@ -0,0 +1,25 @@
+"""
+Numba compatibility shim
+Exposes njit, falling back to a no-op decorator when numba is not installed
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def kernel_array(values):
+    """
+    Coerce values to the C-contiguous, writable float64 array that the
+    explicit float64[::1] kernel signatures require (read-only inputs, such
+    as pandas copy-on-write views, are copied)
+    """
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    return arr if arr.flags.writeable else arr.copy()
@@ -1,25 +1,39 @@
-def backtest(df):
+import numpy as np
+
+from ._njit import njit, kernel_array
+
+
+@njit('Tuple((float64[::1], float64, float64))(float64[::1], float64[::1])', cache=True)
+def _backtest_core(close, rsi):
     balance = 10000.0
     position = 0.0
-    equity_curve = []
+    equity_curve = np.empty(max(close.size - 1, 0))
 
-    for i in range(1, len(df)):
-        price = df["Close"].iloc[i]
-        rsi = df["RSI"].iloc[i]
+    for i in range(1, close.size):
+        price = close[i]
 
-        if rsi < 30 and position == 0:
+        if rsi[i] < 30 and position == 0:
             position = balance / price
-            balance = 0
+            balance = 0.0
 
-        elif rsi > 70 and position > 0:
+        elif rsi[i] > 70 and position > 0:
             balance = position * price
-            position = 0
+            position = 0.0
+
+        equity_curve[i - 1] = balance + position * price
+
+    final_equity = equity_curve[-1] if equity_curve.size > 0 else balance
+    return equity_curve, final_equity, final_equity - 10000.0
+
+
+def backtest(df):
+    close = kernel_array(df["Close"].to_numpy(dtype=np.float64))
+    rsi = kernel_array(df["RSI"].to_numpy(dtype=np.float64))
 
-        equity = balance + position * price
-        equity_curve.append(round(equity, 2))
+    equity_curve, final_equity, profit = _backtest_core(close, rsi)
 
     return {
-        "equity_curve": equity_curve,
-        "final_equity": round(equity_curve[-1], 2),
-        "profit": round(equity_curve[-1] - 10000, 2)
+        "equity_curve": np.round(equity_curve, 2).tolist(),
+        "final_equity": round(float(final_equity), 2),
+        "profit": round(float(profit), 2)
     }
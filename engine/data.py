@@ -3,10 +3,94 @@ Stock Data Module
 Handles fetching and processing stock data from Yahoo Finance
 """
 
-import yfinance as yf
+import threading
+import time
+import numpy as np
 import pandas as pd
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 
+# Seconds a fetched history stays fresh, by interval (daily and longer use the default)
+CACHE_TTL = {
+    '1m': 30,
+    '5m': 30,
+    '15m': 30,
+    '30m': 30,
+    '1h': 300
+}
+DEFAULT_CACHE_TTL = 3600
+
+# Upper bound on cached histories; the least recently used entry is evicted first
+CACHE_SIZE = 512
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+# key -> [lock, threads holding or waiting on it]; dropped when the count hits 0
+_fetch_locks = {}
+
+_yf = None
+
+
+def _get_yf():
+    """Import yfinance on first use so importing the engine stays cheap"""
+    # yfinance shares one keep-alive curl_cffi session across every Ticker and
+    # download in the process, so no session is passed in here; it rejects
+    # plain requests/requests-cache sessions anyway
+    global _yf
+    if _yf is None:
+        import yfinance
+        _yf = yfinance
+    return _yf
+
+
+def cache_ttl(interval):
+    """Seconds a response for this interval may be served from cache"""
+    return CACHE_TTL.get(interval, DEFAULT_CACHE_TTL)
+
+
+def _cached(key):
+    """Return the cached data for key if it has not expired yet, dropping it if it has"""
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return entry[1]
+
+
+def _store(key, data):
+    """Cache data for the TTL of its (ticker, interval, period) key, evicting the LRU entry"""
+    with _cache_lock:
+        _cache[key] = (time.monotonic() + cache_ttl(key[1]), data)
+        _cache.move_to_end(key)
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+@contextmanager
+def _fetch_lock(key):
+    """Per-key lock so only one thread refetches an expired entry"""
+    with _cache_lock:
+        entry = _fetch_locks.get(key)
+        if entry is None:
+            entry = _fetch_locks[key] = [threading.Lock(), 0]
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        # Forget the lock once no thread needs it, so keys that are never
+        # cached (e.g. invalid tickers) do not accumulate
+        with _cache_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _fetch_locks[key]
+
+
 def get_stock_data(ticker, interval='1d', period='1mo'):
     """
     Fetch stock data from Yahoo Finance
@@ -17,55 +101,163 @@ def get_stock_data(ticker, interval='1d', period='1mo'):
         period (str): Data period - '1d', '5d', '1mo', '3mo', '6mo', '1y', '5y'
     
     Returns:
-        dict: Stock data with dates, open, high, low, close, volume
+        dict: Stock data with dates (list of str) and float64 arrays for
+        open, high, low, close, volume
         {
             'dates': ['2024-01-01', '2024-01-02', ...],
-            'open': [150.0, 151.0, ...],
-            'high': [152.0, 153.0, ...],
-            'low': [149.0, 150.0, ...],
-            'close': [151.0, 152.0, ...],
-            'volume': [1000000, 1100000, ...]
+            'open': array([150.0, 151.0, ...]),
+            'high': array([152.0, 153.0, ...]),
+            'low': array([149.0, 150.0, ...]),
+            'close': array([151.0, 152.0, ...]),
+            'volume': array([1000000.0, 1100000.0, ...])
         }
+    
+    Successful results are cached for cache_ttl(interval) seconds.
     """
+    key = (ticker, interval, period)
+    data = _cached(key)
+    if data is not None:
+        return data
+    
+    with _fetch_lock(key):
+        # Another thread may have refreshed the entry while we waited
+        data = _cached(key)
+        if data is not None:
+            return data
+        
+        data = _fetch_stock_data(ticker, interval, period)
+        if 'error' not in data:
+            _store(key, data)
+        return data
+
+
+def _fetch_stock_data(ticker, interval, period):
+    """Download and format history from Yahoo Finance (uncached)"""
     try:
         print(f"📊 Fetching data for {ticker} with interval {interval}...")
         
         # Create ticker object
-        stock = yf.Ticker(ticker)
+        stock = _get_yf().Ticker(ticker)
         
         # Fetch historical data
         df = stock.history(period=period, interval=interval)
         
-        if df.empty:
-            print(f"❌ No data found for {ticker}")
-            return {'error': f'No data found for {ticker}'}
-        
-        # Format dates based on interval
-        if interval in ['1m', '5m', '15m', '30m', '1h']:
-            date_format = '%Y-%m-%d %H:%M'
-        else:
-            date_format = '%Y-%m-%d'
-        
-        # Prepare data
-        data = {
-            'ticker': ticker,
-            'interval': interval,
-            'dates': df.index.strftime(date_format).tolist(),
-            'open': df['Open'].tolist(),
-            'high': df['High'].tolist(),
-            'low': df['Low'].tolist(),
-            'close': df['Close'].tolist(),
-            'volume': df['Volume'].tolist()
-        }
-        
-        print(f"✅ Successfully fetched {len(data['dates'])} data points for {ticker}")
-        return data
+        return _format_history(ticker, interval, df)
         
     except Exception as e:
         print(f"❌ Error fetching data for {ticker}: {str(e)}")
         return {'error': str(e)}
 
 
+def _format_history(ticker, interval, df):
+    """Convert a yfinance OHLCV DataFrame into the stock data dict"""
+    # Yahoo occasionally returns bars without a close; the EMA/MACD recurrences
+    # would carry that NaN into every later value, so drop those rows up front
+    df = df.dropna(subset=['Close'])
+    if df.empty:
+        print(f"❌ No data found for {ticker}")
+        return {'error': f'No data found for {ticker}'}
+    
+    # Format dates based on interval
+    if interval in ['1m', '5m', '15m', '30m', '1h']:
+        date_format = '%Y-%m-%d %H:%M'
+    else:
+        date_format = '%Y-%m-%d'
+    
+    # Prepare data
+    data = {
+        'ticker': ticker,
+        'interval': interval,
+        'dates': df.index.strftime(date_format).tolist(),
+        'open': df['Open'].to_numpy(dtype=np.float64),
+        'high': df['High'].to_numpy(dtype=np.float64),
+        'low': df['Low'].to_numpy(dtype=np.float64),
+        'close': df['Close'].to_numpy(dtype=np.float64),
+        'volume': df['Volume'].to_numpy(dtype=np.float64)
+    }
+    
+    print(f"✅ Successfully fetched {len(data['dates'])} data points for {ticker}")
+    return data
+
+
+def get_stock_data_batch(tickers, interval='1d', period='1mo'):
+    """
+    Fetch several tickers from Yahoo Finance in a single download
+    
+    Args:
+        tickers (list): Stock ticker symbols
+        interval (str): Data interval, as for get_stock_data
+        period (str): Data period, as for get_stock_data
+    
+    Returns:
+        dict: Ticker -> stock data dict (same shape as get_stock_data,
+        or {'error': ...} for symbols that failed)
+    """
+    results = {}
+    missing = _collect_cached(tickers, interval, period, results)
+    if not missing:
+        return results
+    
+    # Hold every missing key's fetch lock, as get_stock_data does, so no other
+    # caller downloads the same ticker meanwhile; sorted so batches cannot deadlock
+    with ExitStack() as stack:
+        for ticker in sorted(set(missing)):
+            stack.enter_context(_fetch_lock((ticker, interval, period)))
+        
+        # Another thread may have fetched some of them while we waited
+        missing = _collect_cached(missing, interval, period, results)
+        if missing:
+            _download_batch(missing, interval, period, results)
+    
+    return results
+
+
+def _collect_cached(tickers, interval, period, results):
+    """Copy cached tickers into results and return the ones still missing"""
+    missing = []
+    for ticker in tickers:
+        data = _cached((ticker, interval, period))
+        if data is not None:
+            results[ticker] = data
+        else:
+            missing.append(ticker)
+    return missing
+
+
+def _download_batch(missing, interval, period, results):
+    """Download missing tickers in one yf.download call into results, caching successes"""
+    try:
+        print(f"📊 Fetching data for {', '.join(missing)} with interval {interval}...")
+        df = _get_yf().download(
+            tickers=' '.join(missing),
+            interval=interval,
+            period=period,
+            group_by='ticker',
+            auto_adjust=True,
+            threads=True,
+            progress=False
+        )
+    except Exception as e:
+        print(f"❌ Error fetching data for {', '.join(missing)}: {str(e)}")
+        results.update((ticker, {'error': str(e)}) for ticker in missing)
+        return
+    
+    for ticker in missing:
+        try:
+            if isinstance(df.columns, pd.MultiIndex):
+                frame = df[ticker]
+            else:
+                frame = df
+            data = _format_history(ticker, interval, frame.dropna(how='all'))
+        except KeyError:
+            print(f"❌ No data found for {ticker}")
+            data = {'error': f'No data found for {ticker}'}
+        
+        if 'error' not in data:
+            _store((ticker, interval, period), data)
+        results[ticker] = data
+
+
 def get_current_price(ticker):
     """
     Get current stock price
@@ -77,7 +269,7 @@ def get_current_price(ticker):
         float: Current stock price or None if error
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = _get_yf().Ticker(ticker)
         info = stock.info
         return info.get('currentPrice') or info.get('regularMarketPrice')
     except:
@@ -95,7 +287,7 @@ def get_stock_info(ticker):
         dict: Stock information
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = _get_yf().Ticker(ticker)
         info = stock.info
         
         return {
@@ -125,7 +317,7 @@ def validate_ticker(ticker):
         bool: True if valid, False otherwise
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = _get_yf().Ticker(ticker)
         info = stock.info
         return 'currentPrice' in info or 'regularMarketPrice' in info
     except:
@@ -6,6 +6,8 @@ Calculate various technical indicators for stock analysis
 import pandas as pd
 import numpy as np
 
+from ._njit import njit, kernel_array
+
 
 def calculate_indicators(stock_data):
     """
@@ -18,50 +20,55 @@ def calculate_indicators(stock_data):
         dict: Technical indicators
     """
     try:
-        # Convert to DataFrame
-        df = pd.DataFrame({
-            'close': [float(x) for x in stock_data['close']],
-            'high': [float(x) for x in stock_data['high']],
-            'low': [float(x) for x in stock_data['low']],
-            'volume': [float(x) for x in stock_data['volume']]
-        })
+        # Convert once to float64 arrays shared by every indicator
+        close = kernel_array(stock_data['close'])
+        high = kernel_array(stock_data['high'])
+        low = kernel_array(stock_data['low'])
+        volume = np.asarray(stock_data['volume'], dtype=np.float64)
+        
+        # One frame for the whole pass so rolling/ewm windows are shared
+        df = pd.DataFrame({'c': close, 'h': high, 'l': low, 'v': volume}, copy=False)
+        c = df['c']
+        current = float(close[-1])
         
         indicators = {}
         
         # RSI (Relative Strength Index)
-        indicators['rsi'] = calculate_rsi(df['close'])
+        indicators['rsi'] = calculate_rsi(close)
         
-        # MACD
-        macd_data = calculate_macd(df['close'])
-        indicators['macd'] = macd_data['macd']
-        indicators['macd_signal'] = macd_data['signal']
-        indicators['macd_histogram'] = macd_data['histogram']
+        # MACD (its fast/slow EMAs double as the ema12/ema26 outputs)
+        ema12, ema26, macd, signal_line = _macd_last(close, 12, 26, 9)
+        indicators['macd'] = float(macd)
+        indicators['macd_signal'] = float(signal_line)
+        indicators['macd_histogram'] = float(macd - signal_line)
         
-        # Moving Averages
-        indicators['ma20'] = calculate_ma(df['close'], 20)
-        indicators['ma50'] = calculate_ma(df['close'], 50)
-        indicators['ma200'] = calculate_ma(df['close'], 200)
+        # Moving Averages (the 20-period window is shared with Bollinger Bands)
+        r20 = c.rolling(window=20)
+        ma20 = r20.mean()
+        std20 = r20.std()
+        indicators['ma20'] = _last(ma20, current)
+        indicators['ma50'] = _last(c.rolling(window=50).mean(), current)
+        indicators['ma200'] = _last(c.rolling(window=200).mean(), current)
         
         # Exponential Moving Averages
-        indicators['ema12'] = calculate_ema(df['close'], 12)
-        indicators['ema26'] = calculate_ema(df['close'], 26)
+        indicators['ema12'] = float(ema12)
+        indicators['ema26'] = float(ema26)
         
         # Bollinger Bands
-        bb = calculate_bollinger_bands(df['close'])
-        indicators['bb_upper'] = bb['upper']
-        indicators['bb_middle'] = bb['middle']
-        indicators['bb_lower'] = bb['lower']
+        indicators['bb_upper'] = float(ma20.iloc[-1] + std20.iloc[-1] * 2)
+        indicators['bb_middle'] = float(ma20.iloc[-1])
+        indicators['bb_lower'] = float(ma20.iloc[-1] - std20.iloc[-1] * 2)
         
         # Stochastic Oscillator
-        stoch = calculate_stochastic(df['high'], df['low'], df['close'])
+        stoch = calculate_stochastic(high, low, close)
         indicators['stoch_k'] = stoch['k']
         indicators['stoch_d'] = stoch['d']
         
         # ATR (Average True Range)
-        indicators['atr'] = calculate_atr(df['high'], df['low'], df['close'])
+        indicators['atr'] = calculate_atr(high, low, close)
         
         # Volume indicators
-        indicators['volume_ma'] = calculate_ma(df['volume'], 20)
+        indicators['volume_ma'] = _last(df['v'].rolling(window=20).mean(), float(volume[-1]))
         
         print(f"✅ Calculated {len(indicators)} technical indicators")
         return indicators
@@ -71,43 +78,88 @@ def calculate_indicators(stock_data):
         return {
             'rsi': 50,
             'macd': 0,
-            'ma20': stock_data['close'][-1] if stock_data['close'] else 0,
-            'ma50': stock_data['close'][-1] if stock_data['close'] else 0
+            'ma20': float(stock_data['close'][-1]) if len(stock_data['close']) > 0 else 0,
+            'ma50': float(stock_data['close'][-1]) if len(stock_data['close']) > 0 else 0
         }
 
 
+def _last(series, default):
+    """Last value of a rolling/ewm result, or default when it is still NaN"""
+    value = series.iloc[-1]
+    return default if pd.isna(value) else float(value)
+
+
+# No fastmath on the kernels that compare prices: a NaN bar must fail those
+# comparisons as it does in pandas, not be assumed away
+@njit('float64(float64[::1], int64)', cache=True, nogil=True)
+def _rsi_loop(prices, period):
+    """RSI of the last bar from simple average gains/losses over period"""
+    n = prices.size
+    if n < period or n < 2:
+        return np.nan
+    
+    gain = 0.0
+    loss = 0.0
+    for i in range(max(n - period, 1), n):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0:
+            gain += delta
+        elif delta < 0:
+            loss -= delta
+    
+    if loss == 0.0:
+        return np.nan if gain == 0.0 else 100.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
 def calculate_rsi(prices, period=14):
     """Calculate Relative Strength Index"""
     try:
-        prices = pd.Series([float(x) for x in prices])
-        delta = prices.diff()
-        
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return float(rsi.iloc[-1]) if not rsi.empty and not pd.isna(rsi.iloc[-1]) else 50.0
+        rsi = _rsi_loop(kernel_array(prices), int(period))
+        return 50.0 if np.isnan(rsi) else float(rsi)
     except:
         return 50.0
 
 
+@njit('UniTuple(float64, 4)(float64[::1], int64, int64, int64)',
+      cache=True, fastmath=True, nogil=True)
+def _macd_last(prices, fast, slow, signal):
+    """
+    Last fast EMA, slow EMA, MACD and signal line, running all three
+    adjust=False recurrences in one pass without materializing any series
+    """
+    if prices.size == 0:
+        return np.nan, np.nan, np.nan, np.nan
+    
+    alpha_fast = 2.0 / (fast + 1.0)
+    alpha_slow = 2.0 / (slow + 1.0)
+    alpha_signal = 2.0 / (signal + 1.0)
+    
+    ema_fast = prices[0]
+    ema_slow = prices[0]
+    macd = 0.0
+    signal_line = 0.0
+    for i in range(1, prices.size):
+        ema_fast = alpha_fast * prices[i] + (1.0 - alpha_fast) * ema_fast
+        ema_slow = alpha_slow * prices[i] + (1.0 - alpha_slow) * ema_slow
+        macd = ema_fast - ema_slow
+        signal_line = alpha_signal * macd + (1.0 - alpha_signal) * signal_line
+    return ema_fast, ema_slow, macd, signal_line
+
+
 def calculate_macd(prices, fast=12, slow=26, signal=9):
     """Calculate MACD (Moving Average Convergence Divergence)"""
     try:
-        prices = pd.Series([float(x) for x in prices])
+        prices = kernel_array(prices)
+        if len(prices) == 0:
+            return {'macd': 0.0, 'signal': 0.0, 'histogram': 0.0}
         
-        exp1 = prices.ewm(span=fast, adjust=False).mean()
-        exp2 = prices.ewm(span=slow, adjust=False).mean()
-        macd = exp1 - exp2
-        signal_line = macd.ewm(span=signal, adjust=False).mean()
-        histogram = macd - signal_line
+        _, _, macd, signal_line = _macd_last(prices, int(fast), int(slow), int(signal))
         
         return {
-            'macd': float(macd.iloc[-1]) if not macd.empty else 0.0,
-            'signal': float(signal_line.iloc[-1]) if not signal_line.empty else 0.0,
-            'histogram': float(histogram.iloc[-1]) if not histogram.empty else 0.0
+            'macd': float(macd),
+            'signal': float(signal_line),
+            'histogram': float(macd - signal_line)
         }
     except:
         return {'macd': 0.0, 'signal': 0.0, 'histogram': 0.0}
@@ -115,41 +167,51 @@ def calculate_macd(prices, fast=12, slow=26, signal=9):
 
 def calculate_ma(prices, period):
     """Calculate Simple Moving Average"""
+    prices = np.asarray(prices, dtype=np.float64)
     try:
-        prices = pd.Series([float(x) for x in prices])
-        ma = prices.rolling(window=period).mean()
-        return float(ma.iloc[-1]) if not ma.empty and not pd.isna(ma.iloc[-1]) else float(prices.iloc[-1])
+        ma = pd.Series(prices, copy=False).rolling(window=period).mean()
+        return float(ma.iloc[-1]) if not ma.empty and not pd.isna(ma.iloc[-1]) else float(prices[-1])
     except:
-        return float(prices.iloc[-1]) if len(prices) > 0 else 0.0
+        return float(prices[-1]) if len(prices) > 0 else 0.0
+
+
+@njit('float64(float64[::1], int64)', cache=True, fastmath=True, nogil=True)
+def _ema_last(prices, span):
+    """Last value of the adjust=False EMA recurrence"""
+    alpha = 2.0 / (span + 1.0)
+    e = prices[0]
+    for i in range(1, prices.size):
+        e = alpha * prices[i] + (1.0 - alpha) * e
+    return e
 
 
 def calculate_ema(prices, period):
     """Calculate Exponential Moving Average"""
+    prices = kernel_array(prices)
     try:
-        prices = pd.Series([float(x) for x in prices])
-        ema = prices.ewm(span=period, adjust=False).mean()
-        return float(ema.iloc[-1]) if not ema.empty else float(prices.iloc[-1])
+        return float(_ema_last(prices, int(period))) if len(prices) > 0 else 0.0
     except:
-        return float(prices.iloc[-1]) if len(prices) > 0 else 0.0
+        return float(prices[-1]) if len(prices) > 0 else 0.0
 
 
 def calculate_bollinger_bands(prices, period=20, std_dev=2):
     """Calculate Bollinger Bands"""
+    prices = np.asarray(prices, dtype=np.float64)
     try:
-        prices = pd.Series([float(x) for x in prices])
+        series = pd.Series(prices, copy=False)
         
-        middle = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
+        middle = series.rolling(window=period).mean()
+        std = series.rolling(window=period).std()
         upper = middle + (std * std_dev)
         lower = middle - (std * std_dev)
         
         return {
-            'upper': float(upper.iloc[-1]) if not upper.empty else float(prices.iloc[-1]) * 1.05,
-            'middle': float(middle.iloc[-1]) if not middle.empty else float(prices.iloc[-1]),
-            'lower': float(lower.iloc[-1]) if not lower.empty else float(prices.iloc[-1]) * 0.95
+            'upper': float(upper.iloc[-1]) if not upper.empty else float(prices[-1]) * 1.05,
+            'middle': float(middle.iloc[-1]) if not middle.empty else float(prices[-1]),
+            'lower': float(lower.iloc[-1]) if not lower.empty else float(prices[-1]) * 0.95
         }
     except:
-        current = float(prices.iloc[-1]) if len(prices) > 0 else 0.0
+        current = float(prices[-1]) if len(prices) > 0 else 0.0
         return {
             'upper': current * 1.05,
             'middle': current,
@@ -157,46 +219,112 @@ def calculate_bollinger_bands(prices, period=20, std_dev=2):
         }
 
 
+@njit('UniTuple(float64, 2)(float64[::1], float64[::1], float64[::1], int64, int64)',
+      cache=True, nogil=True)
+def _stoch_last(high, low, close, k_period, d_period):
+    """%K of the last bar and its d_period average (%D); NaN when undefined"""
+    n = close.size
+    k_last = np.nan
+    k_sum = 0.0
+    d_ok = n - d_period >= k_period - 1
+    
+    # Only the last d_period windows feed the result, so scanning them directly
+    # costs O(k_period * d_period) regardless of the series length
+    for j in range(max(n - d_period, k_period - 1), n):
+        lowest_low = low[j - k_period + 1]
+        highest_high = high[j - k_period + 1]
+        for i in range(j - k_period + 2, j + 1):
+            if low[i] < lowest_low:
+                lowest_low = low[i]
+            if high[i] > highest_high:
+                highest_high = high[i]
+        
+        span = highest_high - lowest_low
+        if span == 0.0:
+            d_ok = False
+            if j == n - 1:
+                k_last = np.nan
+            continue
+        
+        k = 100.0 * (close[j] - lowest_low) / span
+        k_sum += k
+        if j == n - 1:
+            k_last = k
+    
+    return k_last, (k_sum / d_period if d_ok else np.nan)
+
+
 def calculate_stochastic(high, low, close, k_period=14, d_period=3):
     """Calculate Stochastic Oscillator"""
     try:
-        high = pd.Series([float(x) for x in high])
-        low = pd.Series([float(x) for x in low])
-        close = pd.Series([float(x) for x in close])
-        
-        lowest_low = low.rolling(window=k_period).min()
-        highest_high = high.rolling(window=k_period).max()
-        
-        k = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-        d = k.rolling(window=d_period).mean()
-        
+        k, d = _stoch_last(
+            kernel_array(high),
+            kernel_array(low),
+            kernel_array(close),
+            int(k_period),
+            int(d_period)
+        )
         return {
-            'k': float(k.iloc[-1]) if not k.empty and not pd.isna(k.iloc[-1]) else 50.0,
-            'd': float(d.iloc[-1]) if not d.empty and not pd.isna(d.iloc[-1]) else 50.0
+            'k': 50.0 if np.isnan(k) else float(k),
+            'd': 50.0 if np.isnan(d) else float(d)
         }
     except:
         return {'k': 50.0, 'd': 50.0}
 
 
+@njit('float64(float64[::1], float64[::1], float64[::1], int64)',
+      cache=True, nogil=True)
+def _atr_last(high, low, close, period):
+    """Mean true range over the last period bars; NaN when too short"""
+    n = close.size
+    if n < period or n == 0:
+        return np.nan
+    
+    # The first bar of the series has no previous close, so its TR is high - low
+    start = n - period
+    total = 0.0
+    if start == 0:
+        total = high[0] - low[0]
+        start = 1
+    
+    # Element-wise max of the three true-range candidates, summed in place:
+    # no shifted copy, concat frame or per-bar TR array is materialized, and
+    # the previous close is carried in a scalar shared by both gap terms
+    prev_close = close[start - 1]
+    for i in range(start, n):
+        total += max(high[i] - low[i], abs(high[i] - prev_close), abs(low[i] - prev_close))
+        prev_close = close[i]
+    return total / period
+
+
 def calculate_atr(high, low, close, period=14):
     """Calculate Average True Range"""
     try:
-        high = pd.Series([float(x) for x in high])
-        low = pd.Series([float(x) for x in low])
-        close = pd.Series([float(x) for x in close])
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-        
-        return float(atr.iloc[-1]) if not atr.empty and not pd.isna(atr.iloc[-1]) else 0.0
+        atr = _atr_last(
+            kernel_array(high),
+            kernel_array(low),
+            kernel_array(close),
+            int(period)
+        )
+        return 0.0 if np.isnan(atr) else float(atr)
     except:
         return 0.0
 
 
+def warm_up():
+    """Run every kernel once on dummy data so no request pays for first-call setup"""
+    prices = np.linspace(100.0, 110.0, 100)
+    _rsi_loop(prices, 14)
+    _ema_last(prices, 12)
+    _macd_last(prices, 12, 26, 9)
+    _stoch_last(prices + 1.0, prices - 1.0, prices, 14, 3)
+    _atr_last(prices + 1.0, prices - 1.0, prices, 14)
+
+
+# Load the compiled kernels at import rather than on the first request
+warm_up()
+
+
 # Test function
 if __name__ == '__main__':
     print("\n" + "="*50)
@@ -5,7 +5,6 @@ Predict future stock prices using various methods
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
 
 def predict_price(stock_data, indicators):
     """
@@ -19,7 +18,7 @@ def predict_price(stock_data, indicators):
         dict: Price predictions
     """
     try:
-        closes = [float(x) for x in stock_data['close']]
+        closes = np.asarray(stock_data['close'], dtype=np.float64)
         current_price = closes[-1]
         
         # Get trend from indicators
@@ -51,7 +50,7 @@ def predict_price(stock_data, indicators):
         
     except Exception as e:
         print(f"❌ Error making predictions: {str(e)}")
-        current = float(stock_data['close'][-1]) if stock_data['close'] else 100.0
+        current = float(stock_data['close'][-1]) if len(stock_data['close']) > 0 else 100.0
         return {
             'next_hour': current,
             'next_day': current,
@@ -67,19 +66,13 @@ def predict_next_period(current_price, trend_strength, volatility, hours):
     Args:
         current_price (float): Current stock price
         trend_strength (float): Trend strength (-1 to 1)
-        volatility (float): Price volatility
+        volatility (float): Price volatility (unused; kept for callers)
         hours (int): Number of hours ahead
     
     Returns:
-        float: Predicted price
+        float: Predicted price, a deterministic trend extrapolation
     """
-    # Base prediction on trend
-    trend_factor = 1 + (trend_strength * 0.001 * hours)
-    
-    # Add some randomness based on volatility
-    random_factor = np.random.uniform(-volatility/100, volatility/100)
-    
-    predicted_price = current_price * trend_factor * (1 + random_factor)
+    predicted_price = current_price * (1 + trend_strength * 0.001 * hours)
     
     return float(predicted_price)
 
@@ -104,35 +97,20 @@ def calculate_trend_strength(prices, ma20, ma50, rsi, macd):
     """
     try:
         current_price = prices[-1]
-        strength = 0
-        
-        # Price vs MA20 (weight: 0.3)
-        if current_price > ma20:
-            strength += 0.3
-        elif current_price < ma20:
-            strength -= 0.3
-        
-        # MA20 vs MA50 (weight: 0.2)
-        if ma20 > ma50:
-            strength += 0.2
-        elif ma20 < ma50:
-            strength -= 0.2
-        
-        # RSI (weight: 0.3)
-        if rsi > 70:
-            strength -= 0.3  # Overbought
-        elif rsi > 50:
-            strength += 0.15
-        elif rsi < 30:
-            strength += 0.3  # Oversold
-        elif rsi < 50:
-            strength -= 0.15
         
-        # MACD (weight: 0.2)
-        if macd > 0:
-            strength += 0.2
-        elif macd < 0:
-            strength -= 0.2
+        # Weighted votes: price vs MA20 (0.3), MA20 vs MA50 (0.2), RSI (0.3), MACD (0.2);
+        # (a > b) - (a < b) rather than np.sign so a NaN input votes 0 instead of propagating
+        rsi_vote = np.select(
+            [rsi > 70, rsi > 50, rsi < 30, rsi < 50],  # overbought, bullish, oversold, bearish
+            [-0.3, 0.15, 0.3, -0.15],
+            0.0
+        )
+        strength = (
+            0.3 * (int(current_price > ma20) - int(current_price < ma20))
+            + 0.2 * (int(ma20 > ma50) - int(ma20 < ma50))
+            + rsi_vote
+            + 0.2 * (int(macd > 0) - int(macd < 0))
+        )
         
         return float(np.clip(strength, -1, 1))
     except:
@@ -175,21 +153,25 @@ def linear_regression_predict(prices, periods_ahead=5):
     """
     try:
         # Use last 30 data points
-        data = np.array(prices[-30:])
-        X = np.arange(len(data)).reshape(-1, 1)
-        y = data
+        y = np.asarray(prices[-30:], dtype=np.float64)
+        n = y.size
+        if n == 0:
+            return 0.0
+        x = np.arange(n, dtype=np.float64)
+        x_mean = x.mean()
+        y_mean = y.mean()
         
-        # Train model
-        model = LinearRegression()
-        model.fit(X, y)
+        # Ordinary least squares: slope = cov(x, y) / var(x)
+        sxx = ((x - x_mean) ** 2).sum()
+        slope = ((x - x_mean) * (y - y_mean)).sum() / sxx if sxx > 0 else 0.0
+        intercept = y_mean - slope * x_mean
         
         # Predict
-        future_x = np.array([[len(data) + periods_ahead]])
-        prediction = model.predict(future_x)[0]
+        prediction = intercept + slope * (n + periods_ahead)
         
         return float(prediction)
     except:
-        return float(prices[-1]) if prices else 0.0
+        return float(prices[-1]) if len(prices) > 0 else 0.0
 
 
 def calculate_support_resistance(prices, window=20):
@@ -0,0 +1,27 @@
+"""
+Regenerate required_files.txt, the file list test_import.py checks
+Run this after adding or removing a file the Flask app needs
+"""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MANIFEST = ROOT / 'required_files.txt'
+
+# Everything the Flask app loads at runtime
+PATTERNS = ('app.py', 'templates/*.html', 'static/*.js', 'engine/*.py')
+
+
+def main():
+    files = sorted({
+        path.relative_to(ROOT).as_posix()
+        for pattern in PATTERNS
+        for path in ROOT.glob(pattern)
+        if path.is_file()
+    })
+    MANIFEST.write_text("\n".join(files) + "\n")
+    print(f"✅ Wrote {len(files)} paths to {MANIFEST.name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,13 @@ async function analyze() {
     loading.classList.remove('hidden');
     
     try {
+        // Chart series come from the compact binary endpoint; request them
+        // alongside the analysis, and still show the analysis if they fail
+        const chartPromise = loadChart(ticker, interval).catch(error => {
+            console.error('Chart error:', error);
+            return null;
+        });
+        
         // Call backend API
         const response = await fetch('/api/analyze', {
             method: 'POST',
@@ -39,8 +46,10 @@ async function analyze() {
             throw new Error(data.error);
         }
         
+        const chartData = await chartPromise;
+        
         // Update UI with real data
-        updateUI(data);
+        updateUI(data, chartData);
         
     } catch (error) {
         console.error('Error:', error);
@@ -50,8 +59,28 @@ async function analyze() {
     }
 }
 
+// Fetch OHLC series from /api/chart (layout documented in app.py)
+async function loadChart(ticker, interval) {
+    const response = await fetch(`/api/chart/${encodeURIComponent(ticker)}?interval=${encodeURIComponent(interval)}`);
+    
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    const buffer = await response.arrayBuffer();
+    const headerLength = new DataView(buffer).getUint32(0, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)));
+    const values = new Float32Array(buffer, 4 + headerLength, header.fields.length * header.length);
+    
+    const chartData = {dates: header.dates};
+    header.fields.forEach((field, i) => {
+        chartData[field] = Array.from(values.subarray(i * header.length, (i + 1) * header.length));
+    });
+    return chartData;
+}
+
 // Update UI with data from backend
-function updateUI(data) {
+function updateUI(data, chartData) {
     // Update current price
     const currentPrice = data.current_price || data.close;
     const priceChange = data.price_change || 0;
@@ -81,7 +110,7 @@ function updateUI(data) {
     updatePredictions(data);
     
     // Update chart
-    updateChart(data);
+    updateChart(data, chartData);
 }
 
 // Update stat with animation
@@ -149,8 +178,8 @@ function updatePredictions(data) {
 }
 
 // Update chart with candlestick data
-function updateChart(data) {
-    const chartData = data.chart_data || data.historical_data || {};
+function updateChart(data, chartData) {
+    chartData = chartData || {};
     
     if (!chartData.dates || chartData.dates.length === 0) {
         console.warn('No chart data available');